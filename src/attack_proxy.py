@@ -10,20 +10,29 @@ from __future__ import annotations
 import argparse
 import datetime as dt
 import json
+import os
 from pathlib import Path
 from typing import Any, Dict, List, Tuple
 
 import yaml  # type: ignore[import-untyped]
 
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None  # type: ignore[assignment]
+
 from .utils import (
-    apply_drop_indices,
+    DIRECTION_LABELS,
+    apply_drop_and_renumber,
     compute_sequence_numbers,
-    filter_visible_packets,
     load_packet_trace,
     print_packet_table,
     print_sequence_diff,
 )
 
+# Prefer the libyaml-backed loader when PyYAML was built with it.
+_YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
 
 def parse_args() -> argparse.Namespace:
     parser = argparse.ArgumentParser(
@@ -45,13 +54,18 @@ def parse_args() -> argparse.Namespace:
         default="logs",
         help="Directory where JSON logs of before/after traces will be written.",
     )
+    parser.add_argument(
+        "--pretty",
+        action="store_true",
+        help="Write indented, human-readable JSON logs instead of compact JSON.",
+    )
     return parser.parse_args()
 
 
 def load_config(path: str | Path) -> Dict[str, Any]:
     path = Path(path)
-    with path.open("r", encoding="utf-8") as f:
-        config = yaml.safe_load(f)  # type: ignore[no-untyped-call]
+    with path.open("rb") as f:
+        config = yaml.load(f.read(), Loader=_YAML_LOADER)  # type: ignore[no-untyped-call]
     if not isinstance(config, dict):
         raise ValueError(f"Configuration in {path} must be a mapping")
     return config
@@ -81,25 +95,48 @@ def select_drop_indices(config: Dict[str, Any]) -> Tuple[List[int], str]:
     return [int(i) for i in drop_indices], description
 
 
-def serialize_packets_to_json(path: Path, packets: List[Any]) -> None:
-    data = []
-    for pkt in packets:
-        data.append(
-            {
-                "index": pkt.index,
-                "direction": pkt.direction.value,
-                "payload_len": pkt.payload_len,
-                "msg_type": pkt.msg_type,
-                "seq_no": pkt.seq_no,
-                "dropped": pkt.dropped,
-            }
-        )
+def serialize_packets_to_json(
+    path: Path,
+    packets: List[Any],
+    *,
+    pretty: bool = False,
+    durable: bool = False,
+) -> None:
+    """
+    Write packets to `path` as a JSON list using a single write call.
+
+    Output is compact unless `pretty=True`, which indents it for reading.
+    With `durable=True` the file is also fsync'ed before returning.
+    """
+    data = [
+        {
+            "index": pkt.index,
+            "direction": DIRECTION_LABELS[pkt.direction],
+            "payload_len": pkt.payload_len,
+            "msg_type": pkt.msg_type,
+            "seq_no": pkt.seq_no,
+            "dropped": pkt.dropped,
+        }
+        for pkt in packets
+    ]
+    if orjson is not None:
+        buf = orjson.dumps(data, option=orjson.OPT_INDENT_2 if pretty else None)
+    elif pretty:
+        buf = json.dumps(data, indent=2).encode("utf-8")
+    else:
+        buf = json.dumps(data, separators=(",", ":")).encode("utf-8")
+
     path.parent.mkdir(parents=True, exist_ok=True)
-    with path.open("w", encoding="utf-8") as f:
-        json.dump(data, f, indent=2)
+    if not durable:
+        path.write_bytes(buf)
+        return
+    with path.open("wb") as f:
+        f.write(buf)
+        f.flush()
+        os.fsync(f.fileno())
 
 
-def run_demo(config_path: str | Path, log_dir: str | Path) -> None:
+def run_demo(config_path: str | Path, log_dir: str | Path, pretty: bool = False) -> None:
     config = load_config(config_path)
     try:
         pcap_file = config["pcap_file"]
@@ -115,10 +152,7 @@ def run_demo(config_path: str | Path, log_dir: str | Path) -> None:
     print_packet_table(baseline, title="Baseline handshake (no attack)")
 
     print(f"[*] Applying simulated attack using {desc}, dropping packet indices: {drop_indices}")
-    attacked = apply_drop_indices(baseline, drop_indices=drop_indices)
-
-    visible_after_attack = filter_visible_packets(attacked)
-    visible_after_attack = compute_sequence_numbers(visible_after_attack)
+    visible_after_attack = apply_drop_and_renumber(baseline, drop_indices=drop_indices)
 
     print_packet_table(
         visible_after_attack,
@@ -137,8 +171,8 @@ def run_demo(config_path: str | Path, log_dir: str | Path) -> None:
     baseline_log = log_dir / f"baseline_trace_{timestamp}.json"
     attacked_log = log_dir / f"post_attack_trace_{timestamp}.json"
 
-    serialize_packets_to_json(baseline_log, baseline)
-    serialize_packets_to_json(attacked_log, visible_after_attack)
+    serialize_packets_to_json(baseline_log, baseline, pretty=pretty)
+    serialize_packets_to_json(attacked_log, visible_after_attack, pretty=pretty)
 
     print(f"[*] Baseline trace written to: {baseline_log}")
     print(f"[*] Post-attack trace written to: {attacked_log}")
@@ -147,7 +181,7 @@ def run_demo(config_path: str | Path, log_dir: str | Path) -> None:
 
 def main() -> None:
     args = parse_args()
-    run_demo(config_path=args.config, log_dir=args.log_dir)
+    run_demo(config_path=args.config, log_dir=args.log_dir, pretty=args.pretty)
 
 
 if __name__ == "__main__":
@@ -13,21 +13,11 @@ Subcommands
 from __future__ import annotations
 
 import argparse
-import random
 from pathlib import Path
 from typing import List
 
-from . import handshake_demo
-from .attack_proxy import run_demo
-from .utils import (
-    Direction,
-    apply_drop_indices,
-    compute_sequence_numbers,
-    filter_visible_packets,
-    load_packet_trace,
-    print_packet_table,
-    print_sequence_diff,
-)
+# Subcommand dependencies are imported inside each cmd_* function so that a
+# run only pays for the modules it actually uses (e.g. yaml for "attack").
 
 
 def _add_common_trace_arg(parser: argparse.ArgumentParser) -> None:
@@ -67,6 +57,11 @@ def build_parser() -> argparse.ArgumentParser:
         default="logs",
         help="Directory where JSON logs of before/after traces will be written.",
     )
+    p_attack.add_argument(
+        "--pretty",
+        action="store_true",
+        help="Write indented, human-readable JSON logs instead of compact JSON.",
+    )
 
     p_explore = subparsers.add_parser(
         "explore",
@@ -90,14 +85,29 @@ def build_parser() -> argparse.ArgumentParser:
 
 
 def cmd_baseline(pcap: str) -> None:
+    from . import handshake_demo
+
     handshake_demo.run_handshake_demo(pcap)
 
 
-def cmd_attack(config: str, log_dir: str) -> None:
-    run_demo(config_path=config, log_dir=log_dir)
+def cmd_attack(config: str, log_dir: str, pretty: bool = False) -> None:
+    from .attack_proxy import run_demo
+
+    run_demo(config_path=config, log_dir=log_dir, pretty=pretty)
 
 
 def cmd_explore(pcap: str, random_drop: int, seed: int) -> None:
+    import random
+
+    from .utils import (
+        Direction,
+        apply_drop_and_renumber,
+        compute_sequence_numbers,
+        load_packet_trace,
+        print_packet_table,
+        print_sequence_diff,
+    )
+
     trace_path = Path(pcap)
     packets = load_packet_trace(trace_path)
 
@@ -107,27 +117,24 @@ def cmd_explore(pcap: str, random_drop: int, seed: int) -> None:
     client_indices: List[int] = [
         pkt.index
         for pkt in baseline
-        if pkt.direction == Direction.CLIENT_TO_SERVER
+        if pkt.direction is Direction.CLIENT_TO_SERVER
     ]
 
     if not client_indices:
         print("[!] No client-side packets found to drop.")
         return
 
-    if seed != 0:
-        random.seed(seed)
+    rng = random.Random(seed) if seed != 0 else random.Random()
 
     k = max(0, min(random_drop, len(client_indices)))
     if k == 0:
         print("[*] random_drop is 0 or no droppable packets; nothing to drop.")
         return
 
-    chosen = sorted(random.sample(client_indices, k=k))
+    chosen = sorted(rng.sample(client_indices, k=k))
     print(f"[*] Randomly dropping client packet indices: {chosen}")
 
-    attacked = apply_drop_indices(baseline, drop_indices=chosen)
-    visible_after_attack = filter_visible_packets(attacked)
-    visible_after_attack = compute_sequence_numbers(visible_after_attack)
+    visible_after_attack = apply_drop_and_renumber(baseline, drop_indices=chosen)
 
     print_packet_table(
         visible_after_attack,
@@ -148,7 +155,7 @@ def main() -> None:
     if args.command == "baseline":
         cmd_baseline(args.pcap)
     elif args.command == "attack":
-        cmd_attack(args.config, args.log_dir)
+        cmd_attack(args.config, args.log_dir, args.pretty)
     elif args.command == "explore":
         cmd_explore(args.pcap, args.random_drop, args.seed)
     else:
@@ -34,7 +34,7 @@ def parse_args() -> argparse.Namespace:
 def run_handshake_demo(trace_path: str | Path) -> None:
     trace_path = Path(trace_path)
     packets = load_packet_trace(trace_path)
-    packets_with_seq = compute_sequence_numbers(packets)
+    packets_with_seq = compute_sequence_numbers(packets, copy=False)
     print_packet_table(packets_with_seq, title="Baseline handshake (no attack)")
 
 
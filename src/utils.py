@@ -17,12 +17,30 @@ easily from the data files shipped with this project.
 
 from __future__ import annotations
 
+import importlib.util
 import json
 import sys
 from dataclasses import dataclass
 from enum import Enum
+from functools import lru_cache
 from pathlib import Path
-from typing import Iterable, List, TextIO, Dict
+from typing import Any, Iterable, List, Sequence, TextIO, Dict
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None  # type: ignore[assignment]
+
+# Traces at least this long are renumbered with NumPy when it is available.
+# NumPy itself is only imported once a trace crosses the threshold.
+NUMPY_SEQ_THRESHOLD = 1024
+# Traces longer than this use the Numba kernel when Numba is also available;
+# Numba is likewise only imported once a trace crosses the threshold.
+NUMBA_SEQ_THRESHOLD = 4096
+
+# Row templates shared by the table header and every row of the printers.
+_PACKET_ROW_FMT = "{:>3}  {:>4}  {:<16}  {:>5}  {:>5}  {:>7}".format
+_DIFF_ROW_FMT = "{:>3}  {:>4}  {:<16}  {:>10}  {:>10}  {:>8}".format
 
 
 class Direction(str, Enum):
@@ -38,7 +56,14 @@ class Direction(str, Enum):
     SERVER_TO_CLIENT = "S->C"
 
 
-@dataclass
+# Direct lookup from the on-disk direction label to the enum member.
+_DIR_MAP: Dict[str, Direction] = {d.value: d for d in Direction}
+# Display label for each direction; use it when rendering packets instead of
+# reading the Enum `.value` attribute per packet.
+DIRECTION_LABELS: Dict[Direction, str] = {d: d.value for d in Direction}
+
+
+@dataclass(slots=True)
 class Packet:
     """
     A single simplified "SSH packet" used in this demonstration.
@@ -79,6 +104,8 @@ def load_packet_trace(path: str | Path) -> List[Packet]:
     - "payload_len": integer number of bytes
     - "msg_type": string label
 
+    Field values are used as-is, so they must already have these JSON types.
+
     Parameters
     ----------
     path : str or pathlib.Path
@@ -90,30 +117,32 @@ def load_packet_trace(path: str | Path) -> List[Packet]:
         List of Packet objects with indices assigned in order.
     """
     path = Path(path)
-    with path.open("r", encoding="utf-8") as f:
-        raw_packets = json.load(f)
-
-    packets: List[Packet] = []
-    for idx, item in enumerate(raw_packets):
-        direction_str = item["direction"]
-        try:
-            direction = Direction(direction_str)
-        except ValueError as exc:  # pragma: no cover - defensive
-            raise ValueError(f"Invalid direction '{direction_str}' in {path}") from exc
-
-        packets.append(
-            Packet(
-                index=idx,
-                direction=direction,
-                payload_len=int(item["payload_len"]),
-                msg_type=str(item["msg_type"]),
-            )
-        )
-
-    return packets
-
-
-def compute_sequence_numbers(packets: Iterable[Packet]) -> List[Packet]:
+    raw_bytes = path.read_bytes()
+    raw_packets = orjson.loads(raw_bytes) if orjson is not None else json.loads(raw_bytes)
+
+    try:
+        return [
+            Packet(idx, _DIR_MAP[item["direction"]], item["payload_len"], item["msg_type"])
+            for idx, item in enumerate(raw_packets)
+        ]
+    except (KeyError, TypeError) as exc:
+        # Report an unknown or non-string direction as a ValueError; any other
+        # malformed record (e.g. a missing field) propagates unchanged.
+        for item in raw_packets:
+            if isinstance(item, dict) and "direction" in item:
+                direction = item["direction"]
+                if not (isinstance(direction, str) and direction in _DIR_MAP):
+                    raise ValueError(f"Invalid direction '{direction}' in {path}") from exc
+        raise
+
+
+@lru_cache(maxsize=None)
+def _has_module(name: str) -> bool:
+    """Return whether an optional dependency is installed, without importing it."""
+    return importlib.util.find_spec(name) is not None
+
+
+def compute_sequence_numbers(packets: Iterable[Packet], *, copy: bool = True) -> List[Packet]:
     """
     Compute implicit per-direction sequence numbers for the given packets.
 
@@ -125,36 +154,134 @@ def compute_sequence_numbers(packets: Iterable[Packet]) -> List[Packet]:
     ----------
     packets : Iterable[Packet]
         Sequence of packets in chronological order.
+    copy : bool
+        If True (the default), the input packets are left untouched and the
+        result holds fresh copies. If False, `seq_no` is assigned in place on
+        the given Packet objects; only use this when the caller owns them.
 
     Returns
     -------
     List[Packet]
-        New list of Packet objects with `seq_no` fields populated.
+        List of Packet objects with `seq_no` fields populated.
     """
+    if (
+        isinstance(packets, Sequence)
+        and len(packets) >= NUMPY_SEQ_THRESHOLD
+        and _has_module("numpy")
+    ):
+        return compute_sequence_numbers_np(packets, copy=copy)
+
     seq_c2s = 0  # client-to-server sequence number
     seq_s2c = 0  # server-to-client sequence number
 
     result: List[Packet] = []
 
     for pkt in packets:
-        # Create a shallow copy so we do not mutate the caller's objects.
-        pkt_copy = Packet(
-            index=pkt.index,
-            direction=pkt.direction,
-            payload_len=pkt.payload_len,
-            msg_type=pkt.msg_type,
-            seq_no=pkt.seq_no,
-            dropped=pkt.dropped,
-        )
+        if copy:
+            # Create a shallow copy so we do not mutate the caller's objects.
+            pkt = Packet(
+                index=pkt.index,
+                direction=pkt.direction,
+                payload_len=pkt.payload_len,
+                msg_type=pkt.msg_type,
+                seq_no=pkt.seq_no,
+                dropped=pkt.dropped,
+            )
 
-        if pkt_copy.direction == Direction.CLIENT_TO_SERVER:
-            pkt_copy.seq_no = seq_c2s
+        if pkt.direction is Direction.CLIENT_TO_SERVER:
+            pkt.seq_no = seq_c2s
             seq_c2s += 1
         else:
-            pkt_copy.seq_no = seq_s2c
+            pkt.seq_no = seq_s2c
             seq_s2c += 1
 
-        result.append(pkt_copy)
+        result.append(pkt)
+
+    return result
+
+
+# Jitted `_seq_numbers_kernel`, compiled on first use by `_get_seq_numbers_nb`.
+_seq_numbers_nb: Any = None
+
+
+def _seq_numbers_kernel(dirs: Any, out: Any) -> Any:
+    # dirs[i] is 1 for client-to-server packets and 0 otherwise; the seq
+    # numbers are written into the preallocated int32 array `out`.
+    seq_c2s = 0
+    seq_s2c = 0
+    for i in range(dirs.shape[0]):
+        if dirs[i]:
+            out[i] = seq_c2s
+            seq_c2s += 1
+        else:
+            out[i] = seq_s2c
+            seq_s2c += 1
+    return out
+
+
+def _get_seq_numbers_nb() -> Any:
+    """Return the Numba-compiled seq-number kernel, or None if Numba is not installed."""
+    global _seq_numbers_nb
+    if _seq_numbers_nb is None and _has_module("numba"):
+        from numba import njit
+
+        _seq_numbers_nb = njit(cache=True)(_seq_numbers_kernel)
+    return _seq_numbers_nb
+
+
+def compute_sequence_numbers_np(packets: Sequence[Packet], *, copy: bool = True) -> List[Packet]:
+    """
+    NumPy variant of `compute_sequence_numbers` for large traces.
+
+    The per-direction counters are computed with a cumulative sum over a
+    boolean direction mask instead of a Python-level loop. Requires NumPy;
+    traces longer than `NUMBA_SEQ_THRESHOLD` use a compiled Numba kernel
+    instead when Numba is installed.
+
+    Parameters
+    ----------
+    packets : Sequence[Packet]
+        Packets in chronological order.
+    copy : bool
+        Same meaning as in `compute_sequence_numbers`.
+
+    Returns
+    -------
+    List[Packet]
+        List of Packet objects with `seq_no` fields populated.
+    """
+    import numpy as np
+
+    is_c2s = np.fromiter(
+        (pkt.direction is Direction.CLIENT_TO_SERVER for pkt in packets),
+        dtype=np.bool_,
+        count=len(packets),
+    )
+    kernel = _get_seq_numbers_nb() if len(packets) > NUMBA_SEQ_THRESHOLD else None
+    if kernel is not None:
+        seq_arr = kernel(is_c2s.view(np.uint8), np.empty(len(packets), dtype=np.int32))
+    else:
+        c2s_seq = np.cumsum(is_c2s) - 1
+        s2c_seq = np.cumsum(~is_c2s) - 1
+        seq_arr = np.where(is_c2s, c2s_seq, s2c_seq)
+    # tolist() converts back to plain ints so results stay JSON-serializable.
+    seq_nos = seq_arr.tolist()
+
+    result: List[Packet] = []
+
+    for pkt, seq_no in zip(packets, seq_nos):
+        if copy:
+            pkt = Packet(
+                index=pkt.index,
+                direction=pkt.direction,
+                payload_len=pkt.payload_len,
+                msg_type=pkt.msg_type,
+                seq_no=seq_no,
+                dropped=pkt.dropped,
+            )
+        else:
+            pkt.seq_no = seq_no
+        result.append(pkt)
 
     return result
 
@@ -178,27 +305,28 @@ def apply_drop_indices(packets: Iterable[Packet], drop_indices: Iterable[int]) -
     Returns
     -------
     List[Packet]
-        New list of Packet objects. The `dropped` flag is set on the packets
-        that were dropped from the "post-attack" visible trace.
+        New list of Packet objects. The `dropped` flag is set on copies of the
+        packets that were dropped from the "post-attack" visible trace; all
+        other entries are the caller's original objects, so renumber the
+        result with `compute_sequence_numbers(..., copy=True)`.
     """
-    drop_set = set(drop_indices)
-    result: List[Packet] = []
+    drop_set = frozenset(drop_indices)
+    if not drop_set:
+        return list(packets)
 
-    for pkt in packets:
-        pkt_copy = Packet(
+    return [
+        Packet(
             index=pkt.index,
             direction=pkt.direction,
             payload_len=pkt.payload_len,
             msg_type=pkt.msg_type,
             seq_no=pkt.seq_no,
-            dropped=pkt.dropped,
+            dropped=True,
         )
-
-        if pkt_copy.index in drop_set:
-            pkt_copy.dropped = True
-        result.append(pkt_copy)
-
-    return result
+        if pkt.index in drop_set
+        else pkt
+        for pkt in packets
+    ]
 
 
 def filter_visible_packets(packets: Iterable[Packet]) -> List[Packet]:
@@ -218,6 +346,56 @@ def filter_visible_packets(packets: Iterable[Packet]) -> List[Packet]:
     return [pkt for pkt in packets if not pkt.dropped]
 
 
+def apply_drop_and_renumber(packets: Iterable[Packet], drop_indices: Iterable[int]) -> List[Packet]:
+    """
+    Drop packets and renumber the survivors in a single pass.
+
+    Equivalent to calling `apply_drop_indices`, `filter_visible_packets` and
+    `compute_sequence_numbers` in turn, without the intermediate lists.
+
+    Parameters
+    ----------
+    packets : Iterable[Packet]
+        Original packet sequence in chronological order.
+    drop_indices : Iterable[int]
+        Indices (0-based) of packets to drop.
+
+    Returns
+    -------
+    List[Packet]
+        New Packet objects for the visible post-attack trace, with `seq_no`
+        fields populated. The input packets are not modified.
+    """
+    drop_set = frozenset(drop_indices)
+    seq_c2s = 0  # client-to-server sequence number
+    seq_s2c = 0  # server-to-client sequence number
+
+    result: List[Packet] = []
+
+    for pkt in packets:
+        if pkt.dropped or pkt.index in drop_set:
+            continue
+
+        if pkt.direction is Direction.CLIENT_TO_SERVER:
+            seq_no = seq_c2s
+            seq_c2s += 1
+        else:
+            seq_no = seq_s2c
+            seq_s2c += 1
+
+        result.append(
+            Packet(
+                index=pkt.index,
+                direction=pkt.direction,
+                payload_len=pkt.payload_len,
+                msg_type=pkt.msg_type,
+                seq_no=seq_no,
+            )
+        )
+
+    return result
+
+
 def print_packet_table(
     packets: Iterable[Packet],
     title: str | None = None,
@@ -237,25 +415,27 @@ def print_packet_table(
     if file is None:
         file = sys.stdout
 
-    packets_list = list(packets)
+    packets_list = packets if isinstance(packets, list) else list(packets)
 
+    # Collect the whole table and emit it with a single write.
+    lines: List[str] = []
     if title:
-        print(f"\n=== {title} ===", file=file)
+        lines.append(f"\n=== {title} ===")
 
-    header = f"{'idx':>3}  {'dir':>4}  {'type':<16}  {'len':>5}  {'seq':>5}  {'dropped':>7}"
-    print(header, file=file)
-    print("-" * len(header), file=file)
+    header = _PACKET_ROW_FMT("idx", "dir", "type", "len", "seq", "dropped")
+    lines.append(header)
+    lines.append("-" * len(header))
 
     for pkt in packets_list:
         seq_str = "?" if pkt.seq_no is None else str(pkt.seq_no)
         dropped_str = "yes" if pkt.dropped else "no"
-        print(
-            f"{pkt.index:>3}  {pkt.direction.value:>4}  {pkt.msg_type:<16}  "
-            f"{pkt.payload_len:>5}  {seq_str:>5}  {dropped_str:>7}",
-            file=file,
+        lines.append(
+            _PACKET_ROW_FMT(
+                pkt.index, DIRECTION_LABELS[pkt.direction], pkt.msg_type, pkt.payload_len, seq_str, dropped_str
+            )
         )
 
-    print(file=file)
+    file.write("\n".join(lines) + "\n\n")
 
 
 def print_sequence_diff(
@@ -279,31 +459,32 @@ def print_sequence_diff(
     if file is None:
         file = sys.stdout
 
-    base_list = list(baseline)
-    after_list = list(after_attack)
+    base_list = baseline if isinstance(baseline, list) else list(baseline)
+    after_list = after_attack if isinstance(after_attack, list) else list(after_attack)
 
-    base_seq_by_index: Dict[int, int] = {}
+    # Indices are dense (0..N-1), so a list lookup replaces a dict.
+    n_base = max((pkt.index for pkt in base_list), default=-1) + 1
+    base_seq_by_index: List[int | None] = [None] * n_base
     for pkt in base_list:
         if pkt.seq_no is not None:
             base_seq_by_index[pkt.index] = pkt.seq_no
 
+    lines: List[str] = []
     if title:
-        print(f"\n=== {title} ===", file=file)
+        lines.append(f"\n=== {title} ===")
 
-    header = f"{'idx':>3}  {'dir':>4}  {'type':<16}  {'seq_before':>10}  {'seq_after':>10}  {'changed':>8}"
-    print(header, file=file)
-    print("-" * len(header), file=file)
+    header = _DIFF_ROW_FMT("idx", "dir", "type", "seq_before", "seq_after", "changed")
+    lines.append(header)
+    lines.append("-" * len(header))
 
     for pkt in after_list:
-        seq_before = base_seq_by_index.get(pkt.index, None)
+        seq_before = base_seq_by_index[pkt.index] if 0 <= pkt.index < n_base else None
         seq_after = pkt.seq_no
         before_str = "?" if seq_before is None else str(seq_before)
         after_str = "?" if seq_after is None else str(seq_after)
         changed = "yes" if (seq_before is not None and seq_after is not None and seq_before != seq_after) else "no"
-        print(
-            f"{pkt.index:>3}  {pkt.direction.value:>4}  {pkt.msg_type:<16}  "
-            f"{before_str:>10}  {after_str:>10}  {changed:>8}",
-            file=file,
+        lines.append(
+            _DIFF_ROW_FMT(pkt.index, DIRECTION_LABELS[pkt.direction], pkt.msg_type, before_str, after_str, changed)
         )
 
-    print(file=file)
+    file.write("\n".join(lines) + "\n\n")
@@ -0,0 +1,63 @@
+"""
+Unit tests for the JSON trace logs written by the attack proxy demo.
+"""
+
+from __future__ import annotations
+
+import json
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from src import attack_proxy
+from src.attack_proxy import serialize_packets_to_json
+from src.utils import compute_sequence_numbers, load_packet_trace
+
+
+DATA_DIR = Path(__file__).resolve().parent.parent / "data"
+
+
+class SerializePacketsTests(unittest.TestCase):
+    def setUp(self) -> None:
+        tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp_dir.cleanup)
+        self.log_dir = Path(tmp_dir.name) / "logs"
+        self.packets = compute_sequence_numbers(load_packet_trace(DATA_DIR / "sample_trace.json"))
+
+    def _write_both(self) -> tuple[str, str]:
+        compact_path = self.log_dir / "compact.json"
+        pretty_path = self.log_dir / "pretty.json"
+        serialize_packets_to_json(compact_path, self.packets, pretty=False)
+        serialize_packets_to_json(pretty_path, self.packets, pretty=True)
+        return compact_path.read_text(encoding="utf-8"), pretty_path.read_text(encoding="utf-8")
+
+    def _check_formats(self, compact: str, pretty: str) -> None:
+        data = json.loads(compact)
+        self.assertEqual(len(data), len(self.packets))
+        self.assertEqual(data[2]["direction"], "C->S")
+        self.assertEqual(json.loads(pretty), data)
+
+        self.assertFalse(any(ch.isspace() for ch in compact))
+        self.assertEqual(pretty, json.dumps(data, indent=2))
+
+    def test_compact_and_pretty_output(self) -> None:
+        self._check_formats(*self._write_both())
+
+    def test_stdlib_json_fallback(self) -> None:
+        with mock.patch.object(attack_proxy, "orjson", None):
+            fallback = self._write_both()
+        self._check_formats(*fallback)
+        self.assertEqual(fallback, self._write_both())
+
+    def test_durable_write_fsyncs(self) -> None:
+        path = self.log_dir / "durable.json"
+        with mock.patch.object(attack_proxy.os, "fsync") as fsync:
+            serialize_packets_to_json(path, self.packets, durable=True)
+
+        fsync.assert_called_once()
+        self.assertEqual(len(json.loads(path.read_text(encoding="utf-8"))), len(self.packets))
+
+
+if __name__ == "__main__":
+    unittest.main()
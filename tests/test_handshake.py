@@ -4,13 +4,19 @@ Minimal unit tests for the Terrapin-style SSH demo.
 
 from __future__ import annotations
 
+import json
+import tempfile
 import unittest
 from pathlib import Path
 
+from src import utils
 from src.utils import (
     Direction,
+    Packet,
+    apply_drop_and_renumber,
     apply_drop_indices,
     compute_sequence_numbers,
+    compute_sequence_numbers_np,
     filter_visible_packets,
     load_packet_trace,
 )
@@ -29,6 +35,30 @@ class HandshakeDemoTests(unittest.TestCase):
         self.assertEqual(packets[1].direction, Direction.SERVER_TO_CLIENT)
         self.assertEqual(packets[0].msg_type, "KEXINIT")
 
+    def _write_trace(self, records: list) -> Path:
+        tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp_dir.cleanup)
+        path = Path(tmp_dir.name) / "trace.json"
+        path.write_text(json.dumps(records), encoding="utf-8")
+        return path
+
+    def test_load_packet_trace_invalid_direction(self) -> None:
+        for direction in ("X->Y", ["C->S"]):
+            path = self._write_trace(
+                [
+                    {"direction": "C->S", "payload_len": 40, "msg_type": "KEXINIT"},
+                    {"direction": direction, "payload_len": 40, "msg_type": "KEXINIT"},
+                ]
+            )
+            with self.assertRaises(ValueError) as ctx:
+                load_packet_trace(path)
+            self.assertIn(str(path), str(ctx.exception))
+
+    def test_load_packet_trace_missing_field(self) -> None:
+        path = self._write_trace([{"direction": "C->S", "msg_type": "KEXINIT"}])
+        with self.assertRaises(KeyError):
+            load_packet_trace(path)
+
     def test_sequence_numbers_baseline(self) -> None:
         trace_path = DATA_DIR / "sample_trace.json"
         packets = load_packet_trace(trace_path)
@@ -55,6 +85,67 @@ class HandshakeDemoTests(unittest.TestCase):
         c2s_seq = [p.seq_no for p in c2s_packets]
         self.assertEqual(c2s_seq, [0, 1, 2, 3])
 
+    def test_sequence_numbers_in_place(self) -> None:
+        trace_path = DATA_DIR / "sample_trace.json"
+        packets = load_packet_trace(trace_path)
+
+        copied = compute_sequence_numbers(packets)
+        self.assertIsNone(packets[0].seq_no)
+        self.assertIsNot(copied[0], packets[0])
+
+        in_place = compute_sequence_numbers(packets, copy=False)
+        self.assertIs(in_place[0], packets[0])
+        self.assertEqual([p.seq_no for p in in_place], [p.seq_no for p in copied])
+
+    def test_drop_does_not_mutate_baseline(self) -> None:
+        trace_path = DATA_DIR / "sample_trace.json"
+        baseline = compute_sequence_numbers(load_packet_trace(trace_path))
+        baseline_seq = [p.seq_no for p in baseline]
+
+        attacked = apply_drop_indices(baseline, drop_indices=[2])
+        self.assertTrue(attacked[2].dropped)
+        self.assertFalse(baseline[2].dropped)
+
+        compute_sequence_numbers(filter_visible_packets(attacked))
+        self.assertEqual([p.seq_no for p in baseline], baseline_seq)
+
+        self.assertEqual(apply_drop_indices(baseline, drop_indices=[]), baseline)
+
+    def test_apply_drop_and_renumber_matches_pipeline(self) -> None:
+        trace_path = DATA_DIR / "sample_trace.json"
+        baseline = compute_sequence_numbers(load_packet_trace(trace_path))
+
+        for drop_indices in ([], [0], [2], [0, 5, 9]):
+            expected = compute_sequence_numbers(
+                filter_visible_packets(apply_drop_indices(baseline, drop_indices=drop_indices))
+            )
+            self.assertEqual(apply_drop_and_renumber(baseline, drop_indices=drop_indices), expected)
+
+    @unittest.skipUnless(utils._has_module("numpy"), "numpy not installed")
+    def test_sequence_numbers_numpy_matches_python(self) -> None:
+        directions = [Direction.CLIENT_TO_SERVER, Direction.SERVER_TO_CLIENT, Direction.CLIENT_TO_SERVER]
+        packets = [
+            Packet(index=i, direction=directions[i % 3], payload_len=16, msg_type="IGNORE")
+            for i in range(utils.NUMPY_SEQ_THRESHOLD + 5)
+        ]
+
+        expected = [p.seq_no for p in compute_sequence_numbers(iter(packets))]
+        vectorized = compute_sequence_numbers_np(packets)
+        self.assertEqual([p.seq_no for p in vectorized], expected)
+        self.assertIsInstance(vectorized[-1].seq_no, int)
+
+    @unittest.skipUnless(utils._has_module("numba"), "numba not installed")
+    def test_seq_numbers_numba_kernel(self) -> None:
+        import numpy as np
+
+        kernel = utils._get_seq_numbers_nb()
+        self.assertIs(kernel, utils._seq_numbers_nb)
+        self.assertIs(utils._get_seq_numbers_nb(), kernel)
+
+        dirs = np.array([1, 0, 0, 1, 1, 0], dtype=np.uint8)
+        out = kernel(dirs, np.empty(len(dirs), dtype=np.int32))
+        self.assertEqual(out.dtype, np.int32)
+        self.assertEqual(out.tolist(), [0, 0, 1, 1, 2, 2])
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,69 @@
+"""
+Unit tests for the streamed JSON responses of the Flask web app.
+"""
+
+from __future__ import annotations
+
+import json
+import unittest
+from unittest import mock
+
+try:
+    import web_app
+except ImportError:  # pragma: no cover - flask not installed
+    web_app = None
+
+
+@unittest.skipIf(web_app is None, "flask not installed")
+class StreamedJsonTests(unittest.TestCase):
+    def _decode(self, payload: dict) -> object:
+        return json.loads(b"".join(web_app._gen_chunks(payload)))
+
+    def test_gen_chunks_round_trip(self) -> None:
+        payload = {
+            "mode": "attack",
+            "drop_indices": [],
+            "count": 3,
+            "missing": None,
+            "rows": [{"index": i} for i in range(7)],
+        }
+        with mock.patch.object(web_app, "STREAM_CHUNK_ITEMS", 3):
+            # "{", key, "[", three slices of at most 3 rows, "]", "}"
+            self.assertEqual(len(list(web_app._gen_chunks({"rows": payload["rows"]}))), 8)
+            self.assertEqual(self._decode(payload), payload)
+
+    def test_gen_chunks_lazy_rows(self) -> None:
+        calls = []
+
+        def to_rows(items: list) -> list:
+            calls.append(list(items))
+            return [{"value": item * 2} for item in items]
+
+        payload = {"rows": web_app.LazyRows(list(range(5)), to_rows), "empty": web_app.LazyRows([], to_rows)}
+        with mock.patch.object(web_app, "STREAM_CHUNK_ITEMS", 2):
+            decoded = self._decode(payload)
+
+        self.assertEqual(decoded, {"rows": [{"value": i * 2} for i in range(5)], "empty": []})
+        self.assertEqual(calls, [[0, 1], [2, 3], [4]])
+
+    def test_gen_chunks_stdlib_fallback(self) -> None:
+        payload = {"mode": "baseline", "rows": [{"index": i} for i in range(5)], "empty": []}
+        with mock.patch.object(web_app, "orjson", None), mock.patch.object(web_app, "STREAM_CHUNK_ITEMS", 2):
+            self.assertEqual(self._decode(payload), payload)
+            response = web_app.json_response({"error": "bad"}, status=400)
+
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(json.loads(response.get_data()), {"error": "bad"})
+
+    def test_api_run_matches_eager_build(self) -> None:
+        client = web_app.app.test_client()
+        body = json.loads(client.post("/api/run", json={"mode": "baseline"}).get_data())
+
+        packets, _ = web_app.load_trace_cached(web_app.TRACE_PATH)
+        baseline = web_app.compute_sequence_numbers(packets)
+        self.assertEqual(body["baseline"], [web_app.packet_to_dict(p) for p in baseline])
+        self.assertEqual(body["diff"], web_app.build_diff(baseline, baseline))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -6,9 +6,11 @@ Small Flask web app that wraps the Terrapin SSH demo.
 
 from __future__ import annotations
 
+import argparse
+import json
 import sys
 from pathlib import Path
-from typing import Any, Dict, List
+from typing import Any, Callable, Dict, Iterator, List, NamedTuple, Sequence, Tuple
 
 # Ensure the project root (where src/ lives) is on sys.path
 ROOT = Path(__file__).resolve().parent
@@ -17,14 +19,19 @@ if (ROOT / "src").exists():
 elif (ROOT.parent / "src").exists():
     sys.path.insert(0, str(ROOT.parent))
 
-from flask import Flask, jsonify, render_template, request
+from flask import Flask, Response, render_template, request, stream_with_context
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None  # type: ignore[assignment]
 
 from src.utils import (
+    DIRECTION_LABELS,
     Direction,
     Packet,
-    apply_drop_indices,
+    apply_drop_and_renumber,
     compute_sequence_numbers,
-    filter_visible_packets,
     load_packet_trace,
 )
 from src.attack_proxy import load_config, select_drop_indices
@@ -38,11 +45,88 @@ app = Flask(
 TRACE_PATH = Path("data/sample_trace.json")
 CONFIG_PATH = Path("data/demo_config.yaml")
 
+# Number of array elements encoded per chunk of a streamed JSON response.
+STREAM_CHUNK_ITEMS = 256
+
+# Parsed trace/config keyed by path, invalidated when the file's mtime changes.
+# Cached objects are shared across requests and must not be mutated.
+_TRACE_CACHE: Dict[Path, Tuple[int, List[Packet], Tuple[int, ...]]] = {}
+_CONFIG_CACHE: Dict[Path, Tuple[int, Dict[str, Any]]] = {}
+
+
+def load_trace_cached(path: Path) -> Tuple[List[Packet], Tuple[int, ...]]:
+    """Return the parsed trace and the indices of its client-side packets."""
+    mtime = path.stat().st_mtime_ns
+    cached = _TRACE_CACHE.get(path)
+    if cached is not None and cached[0] == mtime:
+        return cached[1], cached[2]
+    packets = load_packet_trace(path)
+    client_indices = tuple(
+        p.index
+        for p in packets
+        if p.direction is Direction.CLIENT_TO_SERVER
+    )
+    _TRACE_CACHE[path] = (mtime, packets, client_indices)
+    return packets, client_indices
+
+
+def load_config_cached(path: Path) -> Dict[str, Any]:
+    mtime = path.stat().st_mtime_ns
+    cached = _CONFIG_CACHE.get(path)
+    if cached is not None and cached[0] == mtime:
+        return cached[1]
+    config = load_config(path)
+    _CONFIG_CACHE[path] = (mtime, config)
+    return config
+
+
+def _dumps(obj: Any) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj).encode("utf-8")
+
+
+def json_response(payload: Dict[str, Any], status: int = 200) -> Response:
+    return Response(_dumps(payload), status=status, mimetype="application/json")
+
+
+class LazyRows(NamedTuple):
+    """A JSON array value whose rows are built one slice at a time while streaming."""
+
+    items: Sequence[Any]
+    to_rows: Callable[[Sequence[Any]], List[Any]]
+
+
+def _gen_chunks(payload: Dict[str, Any]) -> Iterator[bytes]:
+    # Build and encode array values a slice at a time so the first bytes of a
+    # large trace go out before later rows have even been converted to dicts.
+    yield b"{"
+    for i, (key, value) in enumerate(payload.items()):
+        yield (b"," if i else b"") + _dumps(key) + b":"
+        if isinstance(value, LazyRows):
+            items, to_rows = value
+        elif isinstance(value, list):
+            items, to_rows = value, list
+        else:
+            yield _dumps(value)
+            continue
+        yield b"["
+        for start in range(0, len(items), STREAM_CHUNK_ITEMS):
+            rows = to_rows(items[start:start + STREAM_CHUNK_ITEMS])
+            # Strip the enclosing brackets of each encoded slice.
+            yield (b"," if start else b"") + _dumps(rows)[1:-1]
+        yield b"]"
+    yield b"}"
+
+
+def stream_json_response(payload: Dict[str, Any]) -> Response:
+    return Response(stream_with_context(_gen_chunks(payload)), mimetype="application/json")
+
 
 def packet_to_dict(pkt: Packet) -> Dict[str, Any]:
     return {
         "index": pkt.index,
-        "direction": pkt.direction.value,
+        "direction": DIRECTION_LABELS[pkt.direction],
         "msg_type": pkt.msg_type,
         "payload_len": pkt.payload_len,
         "seq_no": pkt.seq_no,
@@ -50,35 +134,60 @@ def packet_to_dict(pkt: Packet) -> Dict[str, Any]:
     }
 
 
-def build_diff(
+def packets_to_dicts(packets: Sequence[Packet]) -> List[Dict[str, Any]]:
+    return [packet_to_dict(p) for p in packets]
+
+
+def diff_row_builder(
     baseline: List[Packet],
-    after_attack: List[Packet],
-) -> List[Dict[str, Any]]:
-    base_seq_by_index: Dict[int, int] = {}
+) -> Callable[[Sequence[Packet]], List[Dict[str, Any]]]:
+    """Index the baseline seq numbers once and return a per-slice diff builder."""
+    # Indices are dense (0..N-1), so a list lookup replaces a dict.
+    n_base = max((pkt.index for pkt in baseline), default=-1) + 1
+    base_seq_by_index: List[int | None] = [None] * n_base
     for pkt in baseline:
         if pkt.seq_no is not None:
             base_seq_by_index[pkt.index] = pkt.seq_no
 
-    diff_rows: List[Dict[str, Any]] = []
-    for pkt in after_attack:
-        seq_before = base_seq_by_index.get(pkt.index)
-        seq_after = pkt.seq_no
-        changed = (
-            seq_before is not None
-            and seq_after is not None
-            and seq_before != seq_after
-        )
-        diff_rows.append(
-            {
-                "index": pkt.index,
-                "direction": pkt.direction.value,
-                "msg_type": pkt.msg_type,
-                "seq_before": seq_before,
-                "seq_after": seq_after,
-                "changed": changed,
-            }
-        )
-    return diff_rows
+    def rows(after_attack: Sequence[Packet]) -> List[Dict[str, Any]]:
+        diff_rows: List[Dict[str, Any]] = []
+        for pkt in after_attack:
+            seq_before = base_seq_by_index[pkt.index] if 0 <= pkt.index < n_base else None
+            seq_after = pkt.seq_no
+            changed = (
+                seq_before is not None
+                and seq_after is not None
+                and seq_before != seq_after
+            )
+            diff_rows.append(
+                {
+                    "index": pkt.index,
+                    "direction": DIRECTION_LABELS[pkt.direction],
+                    "msg_type": pkt.msg_type,
+                    "seq_before": seq_before,
+                    "seq_after": seq_after,
+                    "changed": changed,
+                }
+            )
+        return diff_rows
+
+    return rows
+
+
+def build_diff(
+    baseline: List[Packet],
+    after_attack: List[Packet],
+) -> List[Dict[str, Any]]:
+    return diff_row_builder(baseline)(after_attack)
+
+
+def trace_views(baseline: List[Packet], after_attack: List[Packet]) -> Dict[str, Any]:
+    """The "baseline", "after" and "diff" entries of an /api/run payload, built lazily."""
+    return {
+        "baseline": LazyRows(baseline, packets_to_dicts),
+        "after": LazyRows(after_attack, packets_to_dicts),
+        "diff": LazyRows(after_attack, diff_row_builder(baseline)),
+    }
 
 
 @app.route("/")
@@ -91,35 +200,29 @@ def api_run() -> Any:
     data = request.get_json(force=True, silent=True) or {}
     mode = data.get("mode", "baseline")
 
-    packets = load_packet_trace(TRACE_PATH)
+    packets, client_indices = load_trace_cached(TRACE_PATH)
     baseline = compute_sequence_numbers(packets)
 
     if mode == "baseline":
-        return jsonify(
+        return stream_json_response(
             {
                 "mode": "baseline",
-                "baseline": [packet_to_dict(p) for p in baseline],
-                "after": [packet_to_dict(p) for p in baseline],
-                "diff": build_diff(baseline, baseline),
+                **trace_views(baseline, baseline),
             }
         )
 
     if mode == "attack":
-        config = load_config(CONFIG_PATH)
+        config = load_config_cached(CONFIG_PATH)
         drop_indices, desc = select_drop_indices(config)
 
-        attacked = apply_drop_indices(baseline, drop_indices=drop_indices)
-        visible = filter_visible_packets(attacked)
-        visible_with_seq = compute_sequence_numbers(visible)
+        visible_with_seq = apply_drop_and_renumber(baseline, drop_indices=drop_indices)
 
-        return jsonify(
+        return stream_json_response(
             {
                 "mode": "attack",
                 "description": desc,
                 "drop_indices": drop_indices,
-                "baseline": [packet_to_dict(p) for p in baseline],
-                "after": [packet_to_dict(p) for p in visible_with_seq],
-                "diff": build_diff(baseline, visible_with_seq),
+                **trace_views(baseline, visible_with_seq),
             }
         )
 
@@ -129,44 +232,49 @@ def api_run() -> Any:
         random_drop = int(data.get("random_drop", 1))
         seed = int(data.get("seed", 0))
 
-        client_indices = [
-            p.index
-            for p in baseline
-            if p.direction == Direction.CLIENT_TO_SERVER
-        ]
         if not client_indices or random_drop <= 0:
-            return jsonify(
+            return stream_json_response(
                 {
                     "mode": "explore",
                     "error": "No client packets or random_drop <= 0",
-                    "baseline": [packet_to_dict(p) for p in baseline],
-                    "after": [packet_to_dict(p) for p in baseline],
-                    "diff": build_diff(baseline, baseline),
+                    **trace_views(baseline, baseline),
                 }
             )
 
-        if seed != 0:
-            random.seed(seed)
+        # Flask may serve requests on several threads; keep RNG state per request.
+        rng = random.Random(seed) if seed != 0 else random.Random()
 
         k = max(0, min(random_drop, len(client_indices)))
-        chosen = sorted(random.sample(client_indices, k=k))
+        chosen = sorted(rng.sample(client_indices, k=k))
 
-        attacked = apply_drop_indices(baseline, drop_indices=chosen)
-        visible = filter_visible_packets(attacked)
-        visible_with_seq = compute_sequence_numbers(visible)
+        visible_with_seq = apply_drop_and_renumber(baseline, drop_indices=chosen)
 
-        return jsonify(
+        return stream_json_response(
             {
                 "mode": "explore",
                 "chosen_indices": chosen,
-                "baseline": [packet_to_dict(p) for p in baseline],
-                "after": [packet_to_dict(p) for p in visible_with_seq],
-                "diff": build_diff(baseline, visible_with_seq),
+                **trace_views(baseline, visible_with_seq),
             }
         )
 
-    return jsonify({"error": f"Unknown mode '{mode}'"}), 400
+    return json_response({"error": f"Unknown mode '{mode}'"}, status=400)
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Web UI for the Terrapin-style SSH demo.")
+    parser.add_argument(
+        "--prod",
+        action="store_true",
+        help="Serve with waitress on 0.0.0.0:5000 instead of the Flask development server.",
+    )
+    return parser.parse_args()
 
 
 if __name__ == "__main__":
-    app.run(debug=True)
+    args = parse_args()
+    if args.prod:
+        from waitress import serve
+
+        serve(app, host="0.0.0.0", port=5000, threads=8)
+    else:
+        app.run(debug=True)